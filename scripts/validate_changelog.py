@@ -14,14 +14,21 @@ GITHUB_COMPARE_URL_RE = GITHUB_COMPARE_URL_START_RE + r"([\w.]+)\.\.\.([\w.]+)"
 GITHUB_RELEASE_TAG_URL_START_RE = r"https?://github.com/[^/]+/[^/]+/releases/tag/"
 GITHUB_RELEASE_TAG_URL_RE = GITHUB_RELEASE_TAG_URL_START_RE + r"([\w.]+)"
 UNRELEASED_HEADER = "## [Unreleased]\n"
-VERSION_HEADER_START_RE = r"## \[([\w.]+)\]"
-VERSION_HEADER_FULL_RE = VERSION_HEADER_START_RE + r" - (\d{4}-\d{2}-\d{2})\n"
-UNRELEASED_HYPERLINK_RE = r"\[Unreleased\]: " + GITHUB_COMPARE_URL_RE + r"\n"
-VERSION_HYPERLINK_START_RE = r"\[([\w.]+)\]: "
-VERSION_HYPERLINK_RE = VERSION_HYPERLINK_START_RE + GITHUB_COMPARE_URL_RE + r"\n"
-INITIAL_VERSION_RE = VERSION_HYPERLINK_START_RE + GITHUB_RELEASE_TAG_URL_RE + r"\n"
-SECTION_HEADER_RE = r"### ([^\n]+)\n"
-HTML_COMMENT_RE = r"<!--.*?-->", re.DOTALL
+# The patterns below are matched against single lines of the changelog
+VERSION_HEADER_RE = re.compile(r"## \[([\w.]+)\](?: - (\d{4}-\d{2}-\d{2})$)?")
+VERSION_HYPERLINK_START_RE = re.compile(r"\[([\w.]+)\]: ")
+VERSION_HYPERLINK_RE = re.compile(VERSION_HYPERLINK_START_RE.pattern + GITHUB_COMPARE_URL_RE)
+INITIAL_VERSION_RE = re.compile(VERSION_HYPERLINK_START_RE.pattern + GITHUB_RELEASE_TAG_URL_RE)
+PREVIOUS_VERSION_RE = re.compile(r"\[([^\]]+)\] -")
+HTML_COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+SECTION_ORDER = {
+    "### Added": 0,
+    "### Changed": 1,
+    "### Deprecated": 2,
+    "### Removed": 3,
+    "### Fixed": 4,
+    "### Security": 5,
+}
 
 
 def validate_changelog(changelog_path="CHANGELOG.md"):
@@ -31,58 +38,106 @@ def validate_changelog(changelog_path="CHANGELOG.md"):
         changelog = file.read()
 
     # Remove markdown comments
-    changelog = re.sub(HTML_COMMENT_RE[0], "", changelog, flags=HTML_COMMENT_RE[1])
+    if "<!--" in changelog:
+        changelog = HTML_COMMENT_RE.sub("", changelog)
     # Replace duplicate newlines with a single newline
-    changelog = re.sub(r"\n+", "\n", changelog)
+    while "\n\n" in changelog:
+        changelog = changelog.replace("\n\n", "\n")
     # Replace duplicate spaces with a single space
-    changelog = re.sub(r" +", " ", changelog)
+    while "  " in changelog:
+        changelog = changelog.replace("  ", " ")
+
+    # Gather everything we need to validate in a single pass over the lines of the changelog
+    version_headers = []
+    linked_versions = set()
+    hyperlinks = []
+    initial_version = []
+    section_headers = []
+    changelog_header_lines = []
+    changelog_header_and_bullet_lines = []
+    unreleased_url = None
+    previous_version = None
+    for line in changelog.split("\n"):
+        if line.startswith("##"):
+            changelog_header_lines.append(line)
+            if line.startswith(("## ", "### ")):
+                changelog_header_and_bullet_lines.append(line)
+            if line.startswith("## ["):
+                match = VERSION_HEADER_RE.match(line)
+                if match:
+                    version_headers.append(match.groups())
+                if previous_version is None:
+                    previous_version = PREVIOUS_VERSION_RE.search(line)
+            elif line.startswith("### ") and len(line) > 4:
+                section_headers.append(line[4:])
+        elif line.startswith("-"):
+            changelog_header_and_bullet_lines.append(line)
+        elif line.startswith("["):
+            version_end = line.find("]: ")
+            if version_end == -1:
+                continue
+            linked_versions.add(line[1:version_end])
+            # Only lines that contain a compare or tag URL need to be fully validated
+            if "/compare/" in line:
+                match = VERSION_HYPERLINK_RE.fullmatch(line)
+                if match:
+                    if match[1] != "Unreleased":
+                        hyperlinks.append(match.groups())
+                    elif unreleased_url is None:
+                        unreleased_url = match.groups()[1:]
+                    continue
+            if "/releases/tag/" in line:
+                match = INITIAL_VERSION_RE.fullmatch(line)
+                if match:
+                    initial_version.append(match.groups())
 
     # Ensure `## [Unreleased]\n` is present
-    if changelog.find(UNRELEASED_HEADER) == -1:
+    if UNRELEASED_HEADER not in changelog:
         errors.append("Changelog does contain '## [Unreleased]'")
 
     # Ensure unreleased has a URL
-    unreleased_url = re.search(UNRELEASED_HYPERLINK_RE, changelog)
     if unreleased_url is None:
         errors.append("Unreleased does not have a URL")
 
     # Ensure UNRELEASED_URL_REGEX ends in "HEAD"
-    if unreleased_url and unreleased_url[2] != "HEAD":
+    if unreleased_url and unreleased_url[1] != "HEAD":
         errors.append(
-            f"The hyperlink for [Unreleased] was expected to contain 'HEAD' but instead found '{unreleased_url[2]}'"
+            f"The hyperlink for [Unreleased] was expected to contain 'HEAD' but instead found '{unreleased_url[1]}'"
         )
 
     # Ensure the unreleased URL's version is the previous version (version text proceeding [Unreleased])
     if unreleased_url:
-        previous_version_linked_in_unreleased = unreleased_url[1]
-        previous_version = re.search(r"\[([^\]]+)\] -", changelog)
+        previous_version_linked_in_unreleased = unreleased_url[0]
         if previous_version and previous_version[1] != previous_version_linked_in_unreleased:
             errors.append(
                 f"The hyperlink for [Unreleased] was expected to contain '{previous_version[1]}' but instead found '{previous_version_linked_in_unreleased}'"
             )
 
     # Gather info from version headers. Note that the 'Unreleased' hyperlink is validated separately.
-    versions_from_headers = re.findall(VERSION_HEADER_START_RE, changelog)
-    versions_from_headers = [header for header in versions_from_headers if header != "Unreleased"]
-    dates_from_headers = re.findall(VERSION_HEADER_FULL_RE, changelog)
-    dates_from_headers = [header[1] for header in dates_from_headers if header[0] != "Unreleased"]
+    versions_from_headers = []
+    dates_from_headers = []
+    header_versions = set()
+    dated_header_versions = set()
+    for version, date in version_headers:
+        header_versions.add(version)
+        if date:
+            dated_header_versions.add(version)
+        if version != "Unreleased":
+            versions_from_headers.append(version)
+            if date:
+                dates_from_headers.append(date)
 
     # Ensure each version header has a hyperlink
     for version in versions_from_headers:
-        if re.search(VERSION_HYPERLINK_START_RE.replace(r"[\w.]+", version), changelog) is None:
+        if version not in linked_versions:
             errors.append(f"Version '{version}' does not have a URL")
 
-    # Gather all hyperlinks. Note that the 'Unreleased' hyperlink is validated separately
-    hyperlinks = re.findall(VERSION_HYPERLINK_RE, changelog)
-    hyperlinks = [hyperlink for hyperlink in hyperlinks if hyperlink[0] != "Unreleased"]
-
     # Ensure each hyperlink has a header
     for hyperlink in hyperlinks:
-        if hyperlink[0] not in versions_from_headers:
+        if hyperlink[0] not in header_versions:
             errors.append(f"Hyperlink '{hyperlink[0]}' does not have a version title '## [{hyperlink[0]}]'")
 
     # Ensure there is only one initial version
-    initial_version = re.findall(INITIAL_VERSION_RE, changelog)
     if len(initial_version) > 1:
         errors.append(
             "There is more than one link to a '.../releases/tag/' URL "
@@ -99,30 +154,25 @@ def validate_changelog(changelog_path="CHANGELOG.md"):
             )
 
     # Ensure the initial version has a header
-    if (
-        initial_version
-        and re.search(VERSION_HEADER_START_RE.replace(r"[\w.]+", initial_version[0][0]), changelog) is None
-    ):
+    if initial_version and initial_version[0][0] not in header_versions:
         errors.append(f"Initial version '{initial_version[0][0]}' does not have a version header")
 
     # Ensure all versions headers have dates
-    full_version_headers = re.findall(VERSION_HEADER_FULL_RE, changelog)
-    if len(full_version_headers) != len(versions_from_headers):
+    full_version_headers_count = sum(1 for _, date in version_headers if date)
+    if full_version_headers_count != len(versions_from_headers):
         for version in versions_from_headers:
-            if re.search(VERSION_HEADER_FULL_RE.replace(r"([\w.]+)", rf"({version})"), changelog) is None:
+            if version not in dated_header_versions:
                 errors.append(f"Version header '## [{version}]' does not have a date in the correct format")
 
     # Ensure version links always diff to the previous version
+    hyperlink_set = set(hyperlinks)
     versions_from_hyperlinks = [hyperlinks[0] for hyperlinks in hyperlinks]
     versions_from_hyperlinks.append(initial_version[0][0])
     for position, version in enumerate(versions_from_hyperlinks):
         if position == len(versions_from_hyperlinks) - 1:
             break
 
-        pattern = (
-            rf"\[{version}\]: {GITHUB_COMPARE_URL_START_RE}{versions_from_hyperlinks[position + 1]}\.\.\.{version}"
-        )
-        if re.search(pattern, changelog) is None:
+        if (version, versions_from_hyperlinks[position + 1], version) not in hyperlink_set:
             errors.append(
                 f"Based on hyperlink order, the URL for version '{version}' was expected to contain '.../compare/{versions_from_hyperlinks[position + 1]}...{version}'"
             )
@@ -155,15 +205,11 @@ def validate_changelog(changelog_path="CHANGELOG.md"):
             errors.append(f"Header with date '{date}' should be listed before '{dates_from_headers[position + 1]}'")
 
     # Check if the user is using something other than <Added||Changed||Deprecated||Removed||Fixed||Security>
-    section_headers = re.findall(SECTION_HEADER_RE, changelog)
     for header in section_headers:
         if header not in {"Added", "Changed", "Deprecated", "Removed", "Fixed", "Security"}:
             errors.append(f"Using non-standard section header '{header}'")
 
-    # Check the order of the sections
-    # Simplify the changelog into a list of `##` and `###` headers
-    changelog_header_lines = [line for line in changelog.split("\n") if line.startswith(("###", "##"))]
-    order = ["### Added", "### Changed", "### Deprecated", "### Removed", "### Fixed", "### Security"]
+    # Check the order of the sections, using the list of `##` and `###` headers
     current_position_in_order = -1
     version_header = "UNKNOWN"
     for _line in changelog_header_lines:
@@ -174,8 +220,8 @@ def validate_changelog(changelog_path="CHANGELOG.md"):
             current_position_in_order = -1
 
         # Check if the current section is in the correct order
-        if line in order:
-            section_position = order.index(line)
+        section_position = SECTION_ORDER.get(line)
+        if section_position is not None:
             if section_position < current_position_in_order:
                 errors.append(
                     f"Section '{line}' is out of order in version '{version_header}'. "
@@ -187,9 +233,6 @@ def validate_changelog(changelog_path="CHANGELOG.md"):
             current_position_in_order = section_position
 
     # Find sections with missing bullet points
-    changelog_header_and_bullet_lines = [
-        line for line in changelog.split("\n") if line.startswith(("### ", "## ", "-"))
-    ]
     current_version = "UNKNOWN"
     for position, line in enumerate(changelog_header_and_bullet_lines):
         if line.startswith("## "):
@@ -1,29 +1,33 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
+from collections.abc import Mapping
 
 from asgiref.compatibility import guarantee_single_callable
 
 from servestatic.base import ServeStaticBase
-from servestatic.utils import decode_path_info, get_block_size
+from servestatic.utils import AsyncFile, decode_path_info, get_block_size
 
 
 class ServeStaticASGI(ServeStaticBase):
-    user_app = None
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Ensure ASGI v2 is converted to ASGI v3
+        self.user_app = guarantee_single_callable(self.application)
 
     async def __call__(self, scope, receive, send):
-        # Ensure ASGI v2 is converted to ASGI v3
-        if not self.user_app:
-            self.user_app = guarantee_single_callable(self.application)
+        # Static files are only served over HTTP
+        if scope["type"] != "http":
+            await self.user_app(scope, receive, send)
+            return
 
         # Determine if the request is for a static file
         path = decode_path_info(scope["path"])
-        static_file = None
-        if scope["type"] == "http":
-            if self.autorefresh:
-                static_file = await asyncio.to_thread(self.find_file, path)
-            else:
-                static_file = self.files.get(path)
+        if self.autorefresh:
+            static_file = await asyncio.to_thread(self.find_file, path)
+        else:
+            static_file = self.files.get(path)
 
         # Serve static file if it exists
         if static_file:
@@ -42,25 +46,16 @@ class FileServerASGI:
         self.block_size = get_block_size()
 
     async def __call__(self, scope, receive, send):
-        # Convert ASGI headers into WSGI headers. Allows us to reuse all of our WSGI
-        # header logic inside of aget_response().
-        wsgi_headers = {
-            "HTTP_" + key.decode().upper().replace("-", "_"): value.decode() for key, value in scope["headers"]
-        }
-        wsgi_headers["QUERY_STRING"] = scope["query_string"].decode()
-
-        # Get the ServeStatic file response
-        response = await self.static_file.aget_response(scope["method"], wsgi_headers)
+        # Get the ServeStatic file response. ASGI headers are exposed using WSGI names,
+        # which allows us to reuse all of our WSGI header logic inside of aget_response().
+        response = await self.static_file.aget_response(scope["method"], AsgiToWsgiHeaders(scope))
 
         # Start a new HTTP response for the file
         await send({
             "type": "http.response.start",
             "status": response.status,
-            "headers": [
-                # Convert headers back to ASGI spec
-                (key.lower().encode(), value.encode())
-                for key, value in response.headers
-            ],
+            # Middleware may modify the sent headers in place, so they must be copied
+            "headers": list(response.asgi_headers),
         })
 
         # Head responses have no body, so we terminate early
@@ -68,15 +63,70 @@ class FileServerASGI:
             await send({"type": "http.response.body", "body": b""})
             return
 
-        # Stream the file response body
+        # Let the server send the whole file itself (e.g. via `sendfile`) if it can
+        if isinstance(response.file, AsyncFile) and "http.response.pathsend" in scope.get("extensions", {}):
+            await send({"type": "http.response.pathsend", "path": response.file.name})
+            return
+
+        # Stream the file response body. The next chunk is read while the current
+        # one is being sent, so disk and network IO overlap.
         async with response.file as async_file:
-            while True:
-                chunk = await async_file.read(self.block_size)
-                more_body = bool(chunk)
-                await send({
-                    "type": "http.response.body",
-                    "body": chunk,
-                    "more_body": more_body,
-                })
-                if not more_body:
-                    break
+            next_chunk = asyncio.create_task(async_file.read(self.block_size))
+            try:
+                while True:
+                    chunk = await next_chunk
+                    # Reads only come up short at the end of the file, which saves us
+                    # from reading and sending a final empty chunk
+                    more_body = len(chunk) == self.block_size
+                    if more_body:
+                        next_chunk = asyncio.create_task(async_file.read(self.block_size))
+                    await send({
+                        "type": "http.response.body",
+                        "body": chunk,
+                        "more_body": more_body,
+                    })
+                    if not more_body:
+                        break
+            finally:
+                # Make sure no read is still pending before the file gets closed
+                if not next_chunk.done():
+                    next_chunk.cancel()
+                    with contextlib.suppress(asyncio.CancelledError):
+                        await next_chunk
+
+
+class AsgiToWsgiHeaders(Mapping):
+    """Read-only view of the headers in an ASGI scope, using WSGI environ key names.
+
+    Only a handful of headers are ever read when serving a file, so values are found
+    and decoded on access rather than converting every request header up front."""
+
+    __slots__ = ("headers", "query_string")
+
+    def __init__(self, scope):
+        self.headers = scope["headers"]
+        self.query_string = scope["query_string"]
+
+    def __getitem__(self, key):
+        if key == "QUERY_STRING":
+            return self.query_string.decode("latin-1")
+        if key.startswith("HTTP_"):
+            name = key[5:].lower().replace("_", "-").encode("latin-1")
+            found = None
+            # If a header is duplicated, the last value wins (like building a dict)
+            for header_name, value in self.headers:
+                if header_name.lower() == name:
+                    found = value
+            if found is not None:
+                return found.decode("latin-1")
+        raise KeyError(key)
+
+    def __iter__(self):
+        keys = dict.fromkeys(
+            (b"HTTP_" + header_name.upper().replace(b"-", b"_")).decode("latin-1") for header_name, _ in self.headers
+        )
+        yield "QUERY_STRING"
+        yield from keys
+
+    def __len__(self):
+        return sum(1 for _ in self)
@@ -57,9 +57,16 @@ class ServeStaticBase:
         self._immutable_file_test = immutable_file_test
         self._immutable_file_test_regex: re.Pattern | None = None
         self.media_types = MediaTypes(extra_types=mimetypes)
+        # Formatted Content-Type header values, keyed by media type and charset
+        self.content_types = {}
+        # Header pairs shared between files, so identical headers are only stored once
+        self.header_pairs = {}
         self.application = application
         self.files = {}
         self.directories = []
+        # Index of `directories` keyed by the path segments of their URL prefix. This is
+        # derived from `directories` by `build_directory_trie` and never edited directly.
+        self.directory_trie = {}
 
         if index_file is True:
             self.index_file: str | None = "index.html"
@@ -77,6 +84,10 @@ class ServeStaticBase:
             self.add_files(root, prefix)
 
     def insert_directory(self, root, prefix):
+        # A trailing separator lets `candidate_paths_for_url` check paths are inside
+        # the root with a plain string comparison
+        root = root.rstrip(os.path.sep) + os.path.sep
+        prefix = ensure_leading_trailing_slash(prefix)
         # Exit early if the directory is already in the list
         for existing_root, existing_prefix in self.directories:
             if existing_root == root and existing_prefix == prefix:
@@ -86,6 +97,19 @@ class ServeStaticBase:
         # to store the list of directories in reverse order so later ones
         # match first when they're checked in "autorefresh" mode
         self.directories.insert(0, (root, prefix))
+        self.directory_trie = self.build_directory_trie(self.directories)
+
+    @staticmethod
+    def build_directory_trie(directories):
+        # Directories are stored under the node for their prefix (e.g. "/static/"
+        # is stored at `trie["static"][None]`) alongside their position in the list
+        trie = {}
+        for position, (root, prefix) in enumerate(directories):
+            node = trie
+            for segment in prefix.split("/")[1:-1]:
+                node = node.setdefault(segment, {})
+            node.setdefault(None, []).append((position, root, prefix))
+        return trie
 
     def add_files(self, root, prefix=None):
         root = os.path.abspath(root)
@@ -102,9 +126,12 @@ class ServeStaticBase:
         # Build a mapping from paths to the results of `os.stat` calls
         # so we only have to touch the filesystem once
         stat_cache = dict(scantree(root))
+        # Paths only need converting to URLs where the separator isn't a slash
+        convert_separators = os.path.sep != "/"
         for path in stat_cache:
-            relative_path = path[len(root) :]
-            relative_url = relative_path.replace("\\", "/")
+            relative_url = path[len(root) :]
+            if convert_separators:
+                relative_url = relative_url.replace("\\", "/")
             url = prefix + relative_url
             self.add_file_to_dictionary(url, path, stat_cache=stat_cache)
 
@@ -132,11 +159,28 @@ class ServeStaticBase:
         return None
 
     def candidate_paths_for_url(self, url):
-        for root, prefix in self.directories:
-            if url.startswith(prefix):
-                path = os.path.join(root, url[len(prefix) :])
-                if os.path.commonprefix((root, path)) == root:
-                    yield path
+        for root, prefix in self.directories_for_url(url):
+            path = os.path.join(root, url[len(prefix) :])
+            if path.startswith(root):
+                yield path
+
+    def directories_for_url(self, url):
+        """
+        Return the (root, prefix) pairs whose prefix matches the URL, in the same
+        order as `self.directories`
+        """
+        if not url.startswith("/"):
+            return []
+        node = self.directory_trie
+        matches = list(node.get(None, ()))
+        # The final segment is never followed by a slash, so it can't be part of a prefix
+        for segment in url.split("/")[1:-1]:
+            node = node.get(segment)
+            if node is None:
+                break
+            matches.extend(node.get(None, ()))
+        matches.sort()
+        return [(root, prefix) for _, root, prefix in matches]
 
     def find_file_at_path(self, path, url):
         if self.is_compressed_variant(path):
@@ -167,6 +211,10 @@ class ServeStaticBase:
         """
         if "\\" in url:
             return False
+        # Optimization: an absolute URL without empty or dot-prefixed segments
+        # can't be changed by `normpath`
+        if url[:1] == "/" and "//" not in url and "/." not in url:
+            return True
         normalised = normpath(url)
         if url.endswith("/") and url != "/":
             normalised += "/"
@@ -174,7 +222,7 @@ class ServeStaticBase:
 
     @staticmethod
     def is_compressed_variant(path, stat_cache=None):
-        if path[-3:] in {".gz", ".br"}:
+        if path.endswith((".gz", ".br")):
             uncompressed_path = path[:-3]
             if stat_cache is None:
                 return os.path.isfile(uncompressed_path)
@@ -192,23 +240,50 @@ class ServeStaticBase:
             headers["Access-Control-Allow-Origin"] = "*"
         if self.add_headers_function is not None:
             self.add_headers_function(headers, path, url)
+        encodings = {"gzip": f"{path}.gz", "br": f"{path}.br"}
+        if stat_cache is not None:
+            # Optimization: skip variants we already know don't exist, rather than
+            # raising and catching an error for each
+            encodings = {encoding: alt_path for encoding, alt_path in encodings.items() if alt_path in stat_cache}
+        headers_list = headers.items()
+        if not self.autorefresh:
+            headers_list = [self.header_pairs.setdefault(pair, pair) for pair in headers_list]
         return StaticFile(
             path,
-            headers.items(),
+            headers_list,
             stat_cache=stat_cache,
-            encodings={"gzip": f"{path}.gz", "br": f"{path}.br"},
+            encodings=encodings,
         )
 
     def add_mime_headers(self, headers, path, url):
         media_type = self.media_types.get_type(path)
+        key = (media_type, self.charset)
+        content_type = self.content_types.get(key)
+        if content_type is None:
+            content_type = self.content_types[key] = self.get_content_type(media_type)
+        headers.add_header("Content-Type", content_type)
+
+    def get_content_type(self, media_type):
         params = {"charset": str(self.charset)} if media_type.startswith("text/") else {}
-        headers.add_header("Content-Type", str(media_type), **params)
+        content_type = Headers([])
+        content_type.add_header("Content-Type", str(media_type), **params)
+        return content_type["Content-Type"]
+
+    @property
+    def immutable_cache_control(self):
+        return f"max-age={self.FOREVER}, public, immutable"
+
+    @property
+    def cache_control(self):
+        if self.max_age is None:
+            return None
+        return f"max-age={self.max_age}, public"
 
     def add_cache_headers(self, headers, path, url):
         if self.immutable_file_test(path, url):
-            headers["Cache-Control"] = f"max-age={self.FOREVER}, public, immutable"
+            headers["Cache-Control"] = self.immutable_cache_control
         elif self.max_age is not None:
-            headers["Cache-Control"] = f"max-age={self.max_age}, public"
+            headers["Cache-Control"] = self.cache_control
 
     def immutable_file_test(self, path, url):
         """
@@ -235,5 +310,5 @@ class ServeStaticBase:
         else:
             msg = f"Cannot handle redirect: {from_url} > {to_url}"
             raise ValueError(msg)
-        headers = {"Cache-Control": f"max-age={self.max_age}, public"} if self.max_age is not None else {}
+        headers = {"Cache-Control": self.cache_control} if self.max_age is not None else {}
         return Redirect(relative_url, headers=headers)
@@ -29,6 +29,9 @@ from servestatic.wsgi import ServeStaticBase
 
 __all__ = ["ServeStaticMiddleware"]
 
+# Stateless, so a single instance can be shared by every response without a body
+EMPTY_ASYNC_ITERATOR = EmptyAsyncIterator()
+
 
 class ServeStaticMiddleware(ServeStaticBase):
     """
@@ -46,6 +49,8 @@ class ServeStaticMiddleware(ServeStaticBase):
         markcoroutinefunction(self)
 
         self.get_response = get_response
+        # The finders used to build `get_app_dirs`, along with its result
+        self.app_dirs = None
         debug = settings.DEBUG
         autorefresh = getattr(settings, "SERVESTATIC_AUTOREFRESH", debug)
         max_age = getattr(settings, "SERVESTATIC_MAX_AGE", 0 if debug else 60)
@@ -115,42 +120,56 @@ class ServeStaticMiddleware(ServeStaticBase):
             return await self.aserve(static_file, request)
 
         if django_settings.DEBUG and request.path.startswith(django_settings.STATIC_URL):
-            current_finders = finders.get_finders()
-            app_dirs = [storage.location for finder in current_finders for storage in finder.storages.values()]
-            app_dirs = "\n• ".join(sorted(app_dirs))
+            app_dirs = self.get_app_dirs()
             msg = f"ServeStatic did not find the file '{request.path.lstrip(django_settings.STATIC_URL)}' within the following paths:\n• {app_dirs}"
             raise MissingFileError(msg)
 
         return await self.get_response(request)
 
+    def get_app_dirs(self):
+        """Return the list of static directories shown when a file can't be found in
+        DEBUG mode. This is only rebuilt when Django creates new finders (e.g. when
+        settings change), rather than for every missing file."""
+        current_finders = list(finders.get_finders())
+        if self.app_dirs is None or self.app_dirs[0] != current_finders:
+            app_dirs = [storage.location for finder in current_finders for storage in finder.storages.values()]
+            self.app_dirs = (current_finders, "\n• ".join(sorted(app_dirs)))
+        return self.app_dirs[1]
+
     @staticmethod
     async def aserve(static_file: StaticFile, request: HttpRequest):
         response = await static_file.aget_response(request.method, request.META)
         status = int(response.status)
         http_response = AsyncServeStaticFileResponse(
-            response.file or EmptyAsyncIterator(),
+            response.file or EMPTY_ASYNC_ITERATOR,
             status=status,
+            headers=response.headers,
         )
-        # Remove default content-type
-        del http_response["content-type"]
-        for key, value in response.headers:
-            http_response[key] = value
+        # Remove the default content-type Django adds if ServeStatic didn't set one
+        if not any(key.lower() == "content-type" for key, _ in response.headers):
+            del http_response["content-type"]
         return http_response
 
     def add_files_from_finders(self):
         files = {}
+        # Paths only need converting to URLs where the separator isn't a slash
+        convert_separators = os.path.sep != "/"
+        # The URL prefix for each storage's files. Storages are only set up once, when
+        # their first file is seen
+        url_prefixes = {}
         for finder in finders.get_finders():
             for path, storage in finder.list(None):
-                prefix = (getattr(storage, "prefix", None) or "").strip("/")
-                url = "".join((
-                    self.static_prefix,
-                    prefix,
-                    "/" if prefix else "",
-                    path.replace("\\", "/"),
-                ))
+                url_prefix = url_prefixes.get(storage)
+                if url_prefix is None:
+                    prefix = (getattr(storage, "prefix", None) or "").strip("/")
+                    url_prefix = url_prefixes[storage] = (
+                        f"{self.static_prefix}{prefix}/" if prefix else self.static_prefix
+                    )
+                    self.insert_directory(storage.location, self.static_prefix)
+                relative_url = path.replace("\\", "/") if convert_separators else path
+                url = url_prefix + relative_url
                 # Use setdefault as only first matching file should be used
                 files.setdefault(url, storage.path(path))
-                self.insert_directory(storage.location, self.static_prefix)
 
         stat_cache = stat_files(files.values())
         for url, path in files.items():
@@ -259,7 +278,6 @@ class AsyncServeStaticFileResponse(FileResponse):
         """The way that Django 4.2+ converts async to sync is inefficient, so
         we override it with a better implementation. Django only uses this method
         when running via WSGI."""
-        try:
-            return iter(self.streaming_content)
-        except TypeError:
+        if self.is_async:
             return iter(AsyncToSyncIterator(self.streaming_content))
+        return iter(self.streaming_content)
@@ -8,7 +8,7 @@ import stat
 from email.utils import formatdate, parsedate
 from http import HTTPStatus
 from io import BufferedIOBase
-from time import mktime
+from time import gmtime, mktime
 from urllib.parse import quote
 from wsgiref.headers import Headers
 
@@ -16,12 +16,37 @@ from servestatic.utils import AsyncFile
 
 
 class Response:
-    __slots__ = ("file", "headers", "status")
+    __slots__ = ("_asgi_headers", "file", "headers", "status")
 
-    def __init__(self, status, headers, file):
+    def __init__(self, status, headers, file, asgi_headers=None):
         self.status = status
         self.headers = headers
         self.file = file
+        # A one-item list caching the encoded headers, which may be shared by every
+        # response with the same headers
+        self._asgi_headers = [None] if asgi_headers is None else asgi_headers
+
+    @property
+    def asgi_headers(self):
+        """Headers in ASGI format. These are only encoded when first needed, and may
+        be shared with other responses for the same file, so they are kept as a tuple
+        which must be copied before being handed to an ASGI server."""
+        cache = self._asgi_headers
+        if cache[0] is None:
+            cache[0] = encode_asgi_headers(self.headers)
+        return cache[0]
+
+
+def encode_asgi_headers(headers):
+    return tuple((encode_header(key.lower()), encode_header(value)) for key, value in headers)
+
+
+def encode_header(value):
+    try:
+        return value.encode("latin-1")
+    except UnicodeEncodeError:
+        # Headers set by `add_headers_function` aren't guaranteed to be latin-1
+        return value.encode()
 
 
 NOT_ALLOWED_RESPONSE = Response(
@@ -42,6 +67,9 @@ NOT_MODIFIED_HEADERS = (
 )
 
 
+ENCODING_TOKEN_RE = re.compile(r"\w+")
+
+
 class SlicedFile(BufferedIOBase):
     """
     A file like wrapper to handle seeking to the start byte of a range request
@@ -85,13 +113,14 @@ class AsyncSlicedFile:
         self.remaining = end - start + 1
 
     async def read(self, size=-1):
-        if not self.seeked:
-            await self.fileobj.seek(self.start)
-            self.seeked = True
         if self.remaining <= 0:
             return b""
         size = self.remaining if size < 0 else min(size, self.remaining)
-        data = await self.fileobj.read(size)
+        if not self.seeked:
+            data = await self.fileobj.seek_and_read(self.start, size)
+            self.seeked = True
+        else:
+            data = await self.fileobj.read(size)
         self.remaining -= len(data)
         return data
 
@@ -106,6 +135,11 @@ class AsyncSlicedFile:
 
 
 class StaticFile:
+    # Clients send only a handful of distinct Accept-Encoding values, so the matching
+    # alternative is cached for each. The cache is emptied once it holds this many
+    # values, so clients sending arbitrary headers can't grow it without bound.
+    ALTERNATIVE_CACHE_SIZE = 64
+
     def __init__(self, path, headers, encodings=None, stat_cache=None):
         files = self.get_file_stats(path, encodings, stat_cache)
         headers = self.get_headers(headers, files)
@@ -113,6 +147,7 @@ class StaticFile:
         self.etag = headers["ETag"]
         self.not_modified_response = self.get_not_modified_response(headers)
         self.alternatives = self.get_alternatives(headers, files)
+        self.alternative_cache = {}
 
     def get_response(self, method, request_headers):
         if method not in {"GET", "HEAD"}:
@@ -137,7 +172,7 @@ class StaticFile:
             return NOT_ALLOWED_RESPONSE
         if self.is_not_modified(request_headers):
             return self.not_modified_response
-        path, headers = self.get_path_and_headers(request_headers)
+        _, path, headers, asgi_headers = self.get_alternative(request_headers)
         # We do not await this async file handle to allow us the option of opening
         # it in a thread later
         file_handle = AsyncFile(path, "rb") if method != "HEAD" else None
@@ -148,7 +183,7 @@ class StaticFile:
             # behaviour is allowed by the spec)
             with contextlib.suppress(ValueError):
                 return await self.aget_range_response(range_header, headers, file_handle)
-        return Response(HTTPStatus.OK, headers, file_handle)
+        return Response(HTTPStatus.OK, headers, file_handle, asgi_headers=asgi_headers)
 
     def get_range_response(self, range_header, base_headers, file_handle):
         headers = []
@@ -259,14 +294,19 @@ class StaticFile:
         main_file = files[None]
         if len(files) > 1:
             headers["Vary"] = "Accept-Encoding"
+        last_modified = None
         if "Last-Modified" not in headers:
             mtime = main_file.mtime
             # Not all filesystems report mtimes, and sometimes they report an
             # mtime of 0 which we know is incorrect
             if mtime:
                 headers["Last-Modified"] = formatdate(mtime, usegmt=True)
+                # Optimization: this is the time tuple `parsedate` would return for
+                # the header, without formatting and parsing it again
+                last_modified = gmtime(mtime)[:6] + (0, 1, -1)
         if "ETag" not in headers:
-            last_modified = parsedate(headers["Last-Modified"])
+            if last_modified is None:
+                last_modified = parsedate(headers["Last-Modified"])
             if last_modified:
                 timestamp = int(mktime(last_modified))
                 headers["ETag"] = f'"{timestamp:x}-{main_file.size:x}"'
@@ -287,10 +327,8 @@ class StaticFile:
             headers["Content-Length"] = str(file_entry.size)
             if encoding:
                 headers["Content-Encoding"] = encoding
-                encoding_re = re.compile(rf"\b{encoding}\b")
-            else:
-                encoding_re = re.compile("")
-            alternatives.append((encoding_re, file_entry.path, headers.items()))
+            # The ASGI headers are encoded by the first response which needs them
+            alternatives.append((encoding, file_entry.path, headers.items(), [None]))
         return alternatives
 
     def is_not_modified(self, request_headers):
@@ -309,17 +347,29 @@ class StaticFile:
         return False
 
     def get_path_and_headers(self, request_headers):
+        alternative = self.get_alternative(request_headers)
+        return alternative[1], alternative[2]
+
+    def get_alternative(self, request_headers):
         accept_encoding = request_headers.get("HTTP_ACCEPT_ENCODING", "")
-        if accept_encoding == "*":
-            accept_encoding = ""
+        cache = self.alternative_cache
+        alternative = cache.get(accept_encoding)
+        if alternative is None:
+            alternative = self.match_alternative(accept_encoding)
+            if len(cache) >= self.ALTERNATIVE_CACHE_SIZE:
+                # Clearing is a single atomic operation, unlike evicting individual
+                # entries which can race with other threads inserting into the cache
+                cache.clear()
+            cache[accept_encoding] = alternative
+        return alternative
+
+    def match_alternative(self, accept_encoding):
+        # Encodings match whole words anywhere in the header, so a wildcard or
+        # an empty header only matches the uncompressed file
+        tokens = set(ENCODING_TOKEN_RE.findall(accept_encoding))
         # These are sorted by size so first match is the best
         return next(
-            (
-                (path, headers)
-                for encoding_re, path, headers in self.alternatives
-                if encoding_re.search(accept_encoding)
-            ),
-            None,
+            alternative for alternative in self.alternatives if alternative[0] is None or alternative[0] in tokens
         )
 
 
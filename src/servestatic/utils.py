@@ -13,8 +13,9 @@ if TYPE_CHECKING:  # pragma: no cover
     from collections.abc import AsyncIterable
     from io import IOBase
 
-# This is the same size as wsgiref.FileWrapper
-ASGI_BLOCK_SIZE = 8192
+# Large enough to amortise the cost of each threaded read and ASGI send
+# call when streaming big files
+ASGI_BLOCK_SIZE = 65536
 
 
 def get_block_size():
@@ -25,6 +26,9 @@ def get_block_size():
 # implicit ISO-8859-1 decoding applied in Python 3). Strictly speaking, URLs
 # should only be ASCII anyway, but UTF-8 can be found in the wild.
 def decode_path_info(path_info):
+    # Re-decoding an ASCII path would return an identical string
+    if path_info.isascii():
+        return path_info
     return path_info.encode("iso-8859-1", "replace").decode("utf-8", "replace")
 
 
@@ -37,11 +41,16 @@ def scantree(root):
     """
     Recurse the given directory yielding (pathname, os.stat(pathname)) pairs
     """
-    for entry in os.scandir(root):
-        if entry.is_dir():
-            yield from scantree(entry.path)
-        else:
-            yield entry.path, entry.stat()
+    # Walk iteratively so each directory handle is closed as soon as it's been
+    # read, rather than staying open until the whole subtree is exhausted
+    directories = [root]
+    while directories:
+        with os.scandir(directories.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    directories.append(entry.path)
+                else:
+                    yield entry.path, entry.stat()
 
 
 def stat_files(paths: list[str]) -> dict:
@@ -56,7 +65,8 @@ class AsyncToSyncIterator:
     """Converts any async iterator to sync as efficiently as possible while retaining
     full compatibility with any environment.
 
-    This converter must create a temporary event loop in a thread for two reasons:
+    The iterator is stepped through on a background event loop, which runs in its own
+    thread and is shared by every conversion in the process. This is for two reasons:
     1. Allows us to stream the iterator instead of buffering all contents in memory.
     2. Allows the iterator to be used in environments where an event loop may not exist,
     or may be closed unexpectedly.
@@ -66,18 +76,42 @@ class AsyncToSyncIterator:
         self.iterator = iterator
 
     def __iter__(self):
-        # Create a dedicated event loop to run the async iterator on.
-        loop = asyncio.new_event_loop()
-        thread_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="ServeStatic")
+        loop = get_background_loop()
 
         # Convert from async to sync by stepping through the async iterator and yielding
         # the result of each step.
         generator = self.iterator.__aiter__()
         with contextlib.suppress(GeneratorExit, StopAsyncIteration):
             while True:
-                yield thread_executor.submit(loop.run_until_complete, generator.__anext__()).result()
-        loop.close()
-        thread_executor.shutdown(wait=True)
+                yield asyncio.run_coroutine_threadsafe(anext_step(generator), loop).result()
+
+
+async def anext_step(iterator):
+    # `run_coroutine_threadsafe` only accepts coroutines, but `__anext__` may return
+    # any awaitable
+    return await iterator.__anext__()
+
+
+# Holds a single entry, for the current process
+_background_loops: dict[int, asyncio.AbstractEventLoop] = {}
+_background_loops_lock = threading.Lock()
+
+
+def get_background_loop() -> asyncio.AbstractEventLoop:
+    """Return an event loop that runs forever in a daemon thread. Starting a loop and
+    thread costs far more than a typical static file takes to stream, so one is shared
+    by the whole process rather than created per response."""
+    # Threads don't survive a fork, so each process (e.g. a pre-forked worker) needs its
+    # own loop. The parent's loop is discarded rather than kept alongside it.
+    pid = os.getpid()
+    with _background_loops_lock:
+        loop = _background_loops.get(pid)
+        if loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="ServeStatic", daemon=True).start()
+            _background_loops.clear()
+            _background_loops[pid] = loop
+    return loop
 
 
 def open_lazy(f):
@@ -130,6 +164,10 @@ class AsyncFile:
         self.file_obj: None | IOBase = None
         self.closed = False
 
+    @property
+    def name(self):
+        return self.open_args[0]
+
     async def _execute(self, func, *args):
         """Run a function in a dedicated thread (specific to each AsyncFile instance)."""
         if self.loop is None:
@@ -155,6 +193,20 @@ class AsyncFile:
     async def seek(self, offset, whence=0):
         return await self._execute(self.file_obj.seek, offset, whence)
 
+    async def seek_and_read(self, offset, size=-1):
+        """Seek then read, opening the file first if needed, using a single thread
+        dispatch rather than one for each step."""
+        if self.closed:
+            msg = "I/O operation on closed file."
+            raise ValueError(msg)
+        return await self._execute(self._seek_and_read, offset, size)
+
+    def _seek_and_read(self, offset, size):
+        if self.file_obj is None:
+            self.file_obj = open(*self.open_args)  # pylint: disable=unspecified-encoding
+        self.file_obj.seek(offset)
+        return self.file_obj.read(size)
+
     @open_lazy
     async def __aenter__(self):
         return self
@@ -3,7 +3,7 @@ from __future__ import annotations
 from wsgiref.util import FileWrapper
 
 from servestatic.base import ServeStaticBase
-from servestatic.utils import decode_path_info
+from servestatic.utils import decode_path_info, get_block_size
 
 
 class ServeStatic(ServeStaticBase):
@@ -22,5 +22,7 @@ class ServeStatic(ServeStaticBase):
         start_response(status_line, list(response.headers))
         if response.file is not None:
             file_wrapper = environ.get("wsgi.file_wrapper", FileWrapper)
-            return file_wrapper(response.file)
+            # Servers fall back to reading in blocks when they can't `sendfile` (e.g. for
+            # range requests), and their default block size is only 8 KiB
+            return file_wrapper(response.file, get_block_size())
         return []
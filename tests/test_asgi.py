@@ -6,7 +6,9 @@ from pathlib import Path
 import pytest
 
 from servestatic import utils as servestatic_utils
-from servestatic.asgi import ServeStaticASGI
+from servestatic.asgi import AsgiToWsgiHeaders, ServeStaticASGI
+from servestatic.responders import AsyncSlicedFile
+from servestatic.utils import AsyncFile
 
 from .utils import AsgiReceiveEmulator, AsgiScopeEmulator, AsgiSendEmulator, Files
 
@@ -91,16 +93,14 @@ def test_head_request(application, test_files):
     assert len(send.message) == 2
 
 
-def test_small_block_size(application, test_files):
+def test_small_block_size(application, test_files, monkeypatch):
     scope = AsgiScopeEmulator({"path": "/static/app.js"})
     receive = AsgiReceiveEmulator()
     send = AsgiSendEmulator()
 
-    default_block_size = servestatic_utils.ASGI_BLOCK_SIZE
-    servestatic_utils.ASGI_BLOCK_SIZE = 10
+    monkeypatch.setattr(servestatic_utils, "ASGI_BLOCK_SIZE", 10)
     asyncio.run(application(scope, receive, send))
     assert send[1]["body"] == test_files.js_content[:10]
-    servestatic_utils.ASGI_BLOCK_SIZE = default_block_size
 
 
 def test_request_range_response(application, test_files):
@@ -136,6 +136,147 @@ def test_large_static_file(application, test_files):
     assert len(send.body) == len(test_files.txt_content)
     assert len(send.body) == 10001
     assert send.body == test_files.txt_content
-    assert send.body_count == 2
+    assert send.body_count == 1
+    assert len(send.message) == 2
+    assert send[1]["more_body"] is False
     assert send.headers[b"content-length"] == str(len(test_files.txt_content)).encode()
     assert b"text/plain" in send.headers[b"content-type"]
+
+
+def test_pathsend_extension(application, test_files):
+    scope = AsgiScopeEmulator({"path": "/static/app.js", "extensions": {"http.response.pathsend": {}}})
+    receive = AsgiReceiveEmulator()
+    send = AsgiSendEmulator()
+    asyncio.run(application(scope, receive, send))
+    assert send[1]["type"] == "http.response.pathsend"
+    with open(send[1]["path"], "rb") as f:
+        assert f.read() == test_files.js_content
+    assert send.headers[b"content-length"] == str(len(test_files.js_content)).encode()
+
+
+def test_pathsend_extension_range_request(application, test_files):
+    scope = AsgiScopeEmulator({
+        "path": "/static/app.js",
+        "headers": [(b"range", b"bytes=0-13")],
+        "extensions": {"http.response.pathsend": {}},
+    })
+    receive = AsgiReceiveEmulator()
+    send = AsgiSendEmulator()
+    asyncio.run(application(scope, receive, send))
+    assert send.body == test_files.js_content[:14]
+
+
+def test_send_error_while_streaming(application, test_files, monkeypatch):
+    scope = AsgiScopeEmulator({"path": "/static/large-file.txt", "headers": []})
+    receive = AsgiReceiveEmulator()
+
+    async def send(event):
+        if event["type"] == "http.response.body":
+            raise OSError
+
+    monkeypatch.setattr(servestatic_utils, "ASGI_BLOCK_SIZE", 10)
+    with pytest.raises(OSError):
+        asyncio.run(application(scope, receive, send))
+
+
+def test_not_modified_response(application, test_files):
+    scope = AsgiScopeEmulator({"path": "/static/app.js"})
+    send = AsgiSendEmulator()
+    asyncio.run(application(scope, AsgiReceiveEmulator(), send))
+    etag = send.headers[b"etag"]
+
+    scope = AsgiScopeEmulator({"path": "/static/app.js", "headers": [(b"if-none-match", etag)]})
+    send = AsgiSendEmulator()
+    asyncio.run(application(scope, AsgiReceiveEmulator(), send))
+    assert send.status == 304
+    assert send.body == b""
+
+
+def test_asgi_to_wsgi_headers():
+    scope = AsgiScopeEmulator({
+        "headers": [(b"accept-encoding", b"gzip"), (b"x-forwarded-for", b"1.1.1.1"), (b"accept-encoding", b"br")],
+        "query_string": b"v=1",
+    })
+    headers = AsgiToWsgiHeaders(scope)
+    assert headers["HTTP_ACCEPT_ENCODING"] == "br"
+    assert headers.get("HTTP_RANGE") is None
+    assert headers["QUERY_STRING"] == "v=1"
+    assert dict(headers) == {
+        "QUERY_STRING": "v=1",
+        "HTTP_ACCEPT_ENCODING": "br",
+        "HTTP_X_FORWARDED_FOR": "1.1.1.1",
+    }
+
+
+def test_block_size_multiple(application, test_files, monkeypatch):
+    scope = AsgiScopeEmulator({"path": "/static/app.js"})
+    receive = AsgiReceiveEmulator()
+    send = AsgiSendEmulator()
+
+    monkeypatch.setattr(servestatic_utils, "ASGI_BLOCK_SIZE", len(test_files.js_content))
+    asyncio.run(application(scope, receive, send))
+    assert send.body == test_files.js_content
+    assert send[1]["more_body"] is True
+    assert send[-1] == {"type": "http.response.body", "body": b"", "more_body": False}
+
+
+@pytest.mark.parametrize("path", ["/static/app.js", "/static/with-index"])
+def test_sent_headers_can_be_modified(application, path):
+    async def send(event):
+        if event["type"] == "http.response.start":
+            event["headers"].append((b"x-request-id", b"1"))
+            sent.append(event["headers"])
+
+    sent = []
+    for _ in range(2):
+        asyncio.run(application(AsgiScopeEmulator({"path": path}), AsgiReceiveEmulator(), send))
+    assert sent[0] == sent[1]
+    assert sent[1].count((b"x-request-id", b"1")) == 1
+
+
+def test_non_latin1_header_value(test_files):
+    def add_headers(headers, path, url):
+        headers["X-File-Name"] = "☃.js"
+
+    application = ServeStaticASGI(None, root=test_files.directory, add_headers_function=add_headers)
+    scope = AsgiScopeEmulator({"path": "/static/app.js"})
+    send = AsgiSendEmulator()
+    asyncio.run(application(scope, AsgiReceiveEmulator(), send))
+    assert send.headers[b"x-file-name"] == "☃.js".encode()
+
+
+def test_sliced_file_first_read_is_one_dispatch(test_files, monkeypatch):
+    dispatched = []
+    execute = AsyncFile._execute
+
+    async def counting_execute(self, func, *args):
+        dispatched.append(func)
+        return await execute(self, func, *args)
+
+    monkeypatch.setattr(AsyncFile, "_execute", counting_execute)
+    path = str(Path(test_files.directory) / test_files.js_path)
+
+    async def read_slice():
+        async with AsyncSlicedFile(AsyncFile(path, "rb"), 2, 5) as sliced:
+            return await sliced.read(), await sliced.read()
+
+    assert asyncio.run(read_slice()) == (test_files.js_content[2:6], b"")
+    # A single dispatch to open, seek and read, then one more to close the file
+    assert len(dispatched) == 2
+
+
+def test_asgi_headers_are_encoded_on_first_use(test_files):
+    application = ServeStaticASGI(None, root=test_files.directory)
+    static_file = application.files["/static/app.js"]
+
+    async def get_response():
+        response = await static_file.aget_response("GET", {})
+        await response.file.close()
+        return response
+
+    first = asyncio.run(get_response())
+    # Callers which don't send ASGI headers (e.g. the Django middleware) never encode them
+    assert static_file.alternatives[0][3] == [None]
+    encoded = first.asgi_headers
+    assert static_file.alternatives[0][3] == [encoded]
+    assert asyncio.run(get_response()).asgi_headers is encoded
@@ -20,8 +20,9 @@ from django.core.wsgi import get_wsgi_application
 from django.test.utils import override_settings
 from django.utils.functional import empty
 
+from servestatic import utils as servestatic_utils
 from servestatic.middleware import AsyncServeStaticFileResponse, ServeStaticMiddleware
-from servestatic.utils import AsyncFile
+from servestatic.utils import AsyncFile, AsyncToSyncIterator
 
 from .utils import (
     AppServer,
@@ -453,8 +454,10 @@ def test_large_static_file_2(asgi_application, static_files):
         response_start = await communicator.receive_output()
         response_body = await communicator.receive_output()
         assert response_body["more_body"] is True
-        response_body_2 = await communicator.receive_output()
-        response_body["body"] += response_body_2["body"]
+        # The file is smaller than one block, so the short read ends the file stream
+        # and Django only follows it with its own terminating message
+        assert await communicator.receive_output() == {"type": "http.response.body"}
+        assert await communicator.receive_nothing()
         return response_start | response_body
 
     response = asyncio.run(executor())
@@ -465,3 +468,38 @@ def test_large_static_file_2(asgi_application, static_files):
     assert response["body"] == static_files.txt_content
     assert headers[b"Content-Length"] == str(len(static_files.txt_content)).encode()
     assert b"text/plain" in headers[b"Content-Type"]
+
+
+def test_async_to_sync_iterator_accepts_any_awaitable():
+    class Step:
+        def __init__(self, value):
+            self.value = value
+
+        def __await__(self):
+            if self.value is None:
+                raise StopAsyncIteration
+            return self.value
+            yield  # pragma: no cover
+
+    class Iterator:
+        def __init__(self):
+            self.values = [b"a", b"b", None]
+
+        def __aiter__(self):
+            return self
+
+        def __anext__(self):
+            # Returns an awaitable which isn't a coroutine
+            return Step(self.values.pop(0))
+
+    assert list(AsyncToSyncIterator(Iterator())) == [b"a", b"b"]
+
+
+def test_background_loop_is_replaced_after_fork(monkeypatch):
+    loop = servestatic_utils.get_background_loop()
+    assert servestatic_utils.get_background_loop() is loop
+    monkeypatch.setattr(servestatic_utils.os, "getpid", lambda: -1)
+    child_loop = servestatic_utils.get_background_loop()
+    child_loop.call_soon_threadsafe(child_loop.stop)
+    assert child_loop is not loop
+    assert servestatic_utils._background_loops == {-1: child_loop}
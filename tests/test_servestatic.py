@@ -7,8 +7,11 @@ import stat
 import sys
 import tempfile
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import closing
+from email.utils import formatdate, parsedate
 from pathlib import Path
+from time import mktime
 from urllib.parse import urljoin
 from wsgiref.headers import Headers
 from wsgiref.simple_server import demo_app
@@ -17,6 +20,7 @@ import pytest
 
 from servestatic import ServeStatic
 from servestatic.responders import Redirect, StaticFile
+from servestatic.utils import scantree
 
 from .utils import AppServer, Files
 
@@ -391,3 +395,161 @@ def test_redirect_preserves_query_string():
     responder = Redirect("/redirect/to/here/")
     response = responder.get_response("GET", {"QUERY_STRING": "foo=1&bar=2"})
     assert response.headers[0] == ("Location", "/redirect/to/here/?foo=1&bar=2")
+
+
+def test_directories_for_url_matches_latest_directory_first():
+    instance = ServeStatic(None, autorefresh=True)
+    instance.insert_directory("/root-a/", "/static/")
+    instance.insert_directory("/root-b/", "/")
+    instance.insert_directory("/root-c/", "/static/css/")
+    instance.insert_directory("/root-d/", "/other/")
+    assert instance.directories_for_url("/static/css/app.css") == [
+        ("/root-c/", "/static/css/"),
+        ("/root-b/", "/"),
+        ("/root-a/", "/static/"),
+    ]
+    assert instance.directories_for_url("/static") == [("/root-b/", "/")]
+    assert instance.directories_for_url("static/app.js") == []
+
+
+def test_directory_trie_matches_directories_after_repeated_add_files(tmp_path):
+    instance = ServeStatic(None, autorefresh=True)
+    for root, prefix in [
+        ("a", "/static/"),
+        ("b", None),
+        ("a", "/static/"),
+        ("c", "/static/css/"),
+        ("b", "/static/"),
+        ("a", "static"),
+        ("d", "/static/css/"),
+    ]:
+        instance.add_files(str(tmp_path / root), prefix)
+    assert len(instance.directories) == 5
+    for url in ("/static/css/app.css", "/static/app.js", "/app.js", "/other/app.js"):
+        expected = [(root, prefix) for root, prefix in instance.directories if url.startswith(prefix)]
+        assert instance.directories_for_url(url) == expected
+
+
+def test_directories_for_url_normalises_prefix():
+    instance = ServeStatic(None, autorefresh=True)
+    instance.insert_directory("/root-a/", "/static")
+    instance.insert_directory("/root-b/", "assets/")
+    assert instance.directories_for_url("/static/app.js") == [("/root-a/", "/static/")]
+    assert instance.directories_for_url("/assets/app.js") == [("/root-b/", "/assets/")]
+    assert instance.directories_for_url("/other/app.js") == []
+
+
+@pytest.mark.parametrize(
+    ("url", "expected"),
+    [
+        ("/", True),
+        ("/static/app.js", True),
+        ("/static/", True),
+        ("/.well-known/file", True),
+        ("//static/app.js", True),
+        ("/static//app.js", False),
+        ("/static/./app.js", False),
+        ("/static/../app.js", False),
+        ("/static/..", False),
+        ("/static\\app.js", False),
+    ],
+)
+def test_url_is_canonical(url, expected):
+    assert ServeStatic.url_is_canonical(url) is expected
+
+
+def test_scantree_yields_nested_files(tmp_path):
+    for name in ("a.js", "css/b.css", "css/vendor/c.css"):
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_text(name)
+    files = dict(scantree(str(tmp_path)))
+    assert sorted(os.path.relpath(path, tmp_path) for path in files) == [
+        "a.js",
+        os.path.join("css", "b.css"),
+        os.path.join("css", "vendor", "c.css"),
+    ]
+    assert all(files[path].st_size == len(os.path.relpath(path, tmp_path)) for path in files)
+
+
+def test_candidate_paths_stay_inside_root(tmp_path):
+    root = str(tmp_path / "static")
+    instance = ServeStatic(None, autorefresh=True)
+    instance.insert_directory(root, "/")
+    assert list(instance.candidate_paths_for_url("/app.js")) == [os.path.join(root, "app.js")]
+    escaped = f"{root}-private{os.path.sep}secret.txt"
+    assert list(instance.candidate_paths_for_url(f"/{escaped}")) == []
+
+
+def test_content_type_is_formatted_once_per_media_type():
+    instance = ServeStatic(None, charset="latin-1")
+    for path in ("/static/a.css", "/static/b.css", "/static/c.png"):
+        instance.add_mime_headers(Headers([]), path, path)
+    assert instance.content_types == {
+        ("text/css", "latin-1"): 'text/css; charset="latin-1"',
+        ("image/png", "latin-1"): "image/png",
+    }
+
+
+def test_header_settings_can_be_changed_after_init(tmp_path):
+    (tmp_path / "a.css").write_text("a")
+    instance = ServeStatic(None, max_age=60)
+    instance.add_files(str(tmp_path))
+    instance.max_age = 120
+    instance.charset = "latin-1"
+    instance.add_files(str(tmp_path), prefix="other")
+    headers = dict(instance.files["/other/a.css"].alternatives[0][2])
+    assert headers["Cache-Control"] == "max-age=120, public"
+    assert headers["Content-Type"] == 'text/css; charset="latin-1"'
+
+
+def test_identical_headers_are_shared_between_files(tmp_path):
+    (tmp_path / "a.js").write_text("a")
+    (tmp_path / "b.js").write_text("b")
+    instance = ServeStatic(None, root=str(tmp_path))
+    headers_a = instance.files["/a.js"].alternatives[0][2]
+    headers_b = instance.files["/b.js"].alternatives[0][2]
+    content_type_a = next(pair for pair in headers_a if pair[0] == "Content-Type")
+    content_type_b = next(pair for pair in headers_b if pair[0] == "Content-Type")
+    assert content_type_a is content_type_b
+
+
+def test_alternative_cache_is_bounded(tmp_path):
+    (tmp_path / "a.js").write_text("a" * 1000)
+    (tmp_path / "a.js.gz").write_text("a")
+    static_file = ServeStatic(None, root=str(tmp_path)).files["/a.js"]
+    for i in range(StaticFile.ALTERNATIVE_CACHE_SIZE):
+        static_file.get_alternative({"HTTP_ACCEPT_ENCODING": f"gzip, x-{i}"})
+    assert len(static_file.alternative_cache) == StaticFile.ALTERNATIVE_CACHE_SIZE
+    # Once full, the cache is emptied rather than growing further
+    for accept_encoding in ("br", "deflate, gzip"):
+        static_file.get_alternative({"HTTP_ACCEPT_ENCODING": accept_encoding})
+    assert list(static_file.alternative_cache) == ["br", "deflate, gzip"]
+    path, _ = static_file.get_path_and_headers({"HTTP_ACCEPT_ENCODING": "deflate, gzip"})
+    assert path.endswith(".gz")
+    path, _ = static_file.get_path_and_headers({"HTTP_ACCEPT_ENCODING": "br"})
+    assert not path.endswith(".gz")
+
+
+def test_etag_uses_last_modified_timestamp(tmp_path):
+    path = tmp_path / "a.js"
+    path.write_text("abc")
+    mtime = 1700000000.5
+    os.utime(path, (mtime, mtime))
+    static_file = StaticFile(str(path), [])
+    timestamp = int(mktime(parsedate(formatdate(mtime, usegmt=True))))
+    assert static_file.etag == f'"{timestamp:x}-3"'
+
+
+def test_alternative_cache_is_thread_safe_when_full(tmp_path):
+    (tmp_path / "a.js").write_text("a" * 1000)
+    (tmp_path / "a.js.gz").write_text("a")
+    static_file = ServeStatic(None, root=str(tmp_path)).files["/a.js"]
+
+    def request_many(thread):
+        for i in range(2000):
+            static_file.get_alternative({"HTTP_ACCEPT_ENCODING": f"gzip, x-{thread}-{i}"})
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        # Re-raises any error from the worker threads
+        list(executor.map(request_many, range(8)))
+    assert len(static_file.alternative_cache) <= StaticFile.ALTERNATIVE_CACHE_SIZE
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from servestatic.utils import ensure_leading_trailing_slash
+from servestatic.utils import decode_path_info, ensure_leading_trailing_slash
 
 
 def test_none():
@@ -25,3 +25,11 @@ def test_leading():
 
 def test_trailing():
     assert ensure_leading_trailing_slash("foo/") == "/foo/"
+
+
+def test_decode_ascii_path():
+    assert decode_path_info("/static/app.js") == "/static/app.js"
+
+
+def test_decode_utf8_path():
+    assert decode_path_info("/nonascii\u00e2\u009c\u0093.txt") == "/nonascii\u2713.txt"